@@ -5,19 +5,17 @@ This example demonstrates the basics of LangChain:
 - Creating a prompt template
 - Setting up an LLM
 - Creating and running a simple chain
+- Running several inputs through the chain in one batched request
 
 Prerequisites:
 - Set up your OPENAI_API_KEY in .env file
 """
 
 import os
-from dotenv import load_dotenv
 from langchain_openai import OpenAI
 from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-
-# Load environment variables
-load_dotenv()
+# Importing common also loads environment variables from .env
+from common import get_async_http_client, get_http_client
 
 def main():
     """
@@ -34,7 +32,11 @@ def main():
         return
     
     # Initialize the LLM
-    llm = OpenAI(temperature=0.7)
+    llm = OpenAI(
+        temperature=0.7,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client()
+    )
     
     # Create a prompt template
     template = """
@@ -50,8 +52,8 @@ def main():
         template=template
     )
     
-    # Create a chain
-    chain = LLMChain(llm=llm, prompt=prompt)
+    # Create a chain by piping the prompt into the LLM
+    chain = prompt | llm
     
     # Example questions
     questions = [
@@ -60,12 +62,15 @@ def main():
         "How does an LLM chain work?"
     ]
     
-    # Run the chain with different questions
-    for i, question in enumerate(questions, 1):
+    # Run the chain on all questions at once. The LLM receives every
+    # formatted prompt in one generate() call, and OpenAI's completions
+    # API answers them all in a single request.
+    inputs = [{"question": question} for question in questions]
+    responses = chain.batch(inputs)
+    
+    for i, (question, response) in enumerate(zip(questions, responses), 1):
         print(f"\nQuestion {i}: {question}")
         print("-" * 50)
-        
-        response = chain.run(question=question)
         print(f"Answer: {response.strip()}")
         print()
     
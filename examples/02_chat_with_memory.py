@@ -3,22 +3,19 @@ Example 2: Chat Model with Memory
 
 This example demonstrates:
 - Using chat models (designed for conversations)
-- Implementing conversation memory
+- Implementing conversation memory with a message history
 - Maintaining context across multiple turns
+- Streaming responses as they are generated
 
 Prerequisites:
 - Set up your OPENAI_API_KEY in .env file
 """
 
 import os
-from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
-from langchain.chains import ConversationChain
-from langchain.memory import ConversationBufferMemory
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-
-# Load environment variables
-load_dotenv()
+from langchain.schema import AIMessage, HumanMessage, SystemMessage
+# Importing common also loads environment variables from .env
+from common import get_async_http_client, get_http_client, get_rate_limiter
 
 def main():
     """
@@ -35,18 +32,20 @@ def main():
         return
     
     # Initialize the Chat Model
-    chat_model = ChatOpenAI(temperature=0.7, model="gpt-3.5-turbo")
-    
-    # Create conversation memory
-    memory = ConversationBufferMemory(return_messages=True)
-    
-    # Create a conversation chain
-    conversation = ConversationChain(
-        llm=chat_model,
-        memory=memory,
-        verbose=True  # Shows the conversation flow
+    chat_model = ChatOpenAI(
+        temperature=0.7,
+        model="gpt-3.5-turbo",
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        rate_limiter=get_rate_limiter()
     )
     
+    # The conversation memory is simply the list of messages exchanged so far.
+    # It is sent to the chat model as-is on every turn.
+    messages = [
+        SystemMessage(content="You are a friendly assistant helping someone learn LangChain.")
+    ]
+    
     print("\nStarting a conversation with memory...")
     print("The model will remember previous exchanges.\n")
     
@@ -65,8 +64,17 @@ def main():
         print(f"User: {user_input}")
         print()
         
-        response = conversation.predict(input=user_input)
-        print(f"Assistant: {response}")
+        messages.append(HumanMessage(content=user_input))
+        
+        # Stream the reply so it is printed as soon as the first tokens arrive
+        print("Assistant: ", end="", flush=True)
+        reply_parts = []
+        for chunk in chat_model.stream(messages):
+            print(chunk.content, end="", flush=True)
+            reply_parts.append(chunk.content)
+        print()
+        
+        messages.append(AIMessage(content="".join(reply_parts)))
     
     print("\n" + "=" * 50)
     print("Conversation History:")
@@ -74,9 +82,11 @@ def main():
     
     # Display the conversation history
     print("\nThe model remembered:")
-    for message in memory.chat_memory.messages:
-        role = "User" if message.type == "human" else "Assistant"
-        print(f"{role}: {message.content[:100]}...")
+    history_lines = []
+    for message in messages[1:]:  # Skip the system message
+        role = "User" if isinstance(message, HumanMessage) else "Assistant"
+        history_lines.append(f"{role}: {message.content[:100]}...")
+    print("\n".join(history_lines))
     
     print("\n" + "=" * 50)
     print("Example completed!")
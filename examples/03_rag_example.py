@@ -16,21 +16,47 @@ Prerequisites:
 - Set up your OPENAI_API_KEY in .env file
 """
 
+import asyncio
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
+import faiss
+import numpy as np
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain.text_splitter import CharacterTextSplitter
-from langchain_community.vectorstores import Chroma
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain.chains import RetrievalQA
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 from langchain.schema import Document
+# Importing common also loads environment variables from .env
+from common import (
+    gather_bounded,
+    get_async_http_client,
+    get_http_client,
+    get_rate_limiter,
+)
 
-# Load environment variables
-load_dotenv()
+# Splits documents into chunks of up to 500 characters with a small overlap
+TEXT_SPLITTER = CharacterTextSplitter(
+    chunk_size=500,
+    chunk_overlap=50
+)
 
+# HNSW index settings: graph neighbours per vector, and how many candidates
+# to consider while building the graph and while searching it
+HNSW_NEIGHBORS = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+@lru_cache(maxsize=None)
 def create_sample_documents():
     """
     Create sample documents about LangChain for demonstration.
     In a real application, you would load these from files, databases, etc.
+    The sample corpus never changes, so it is built once and reused; it is
+    returned as a tuple so the shared sequence itself can't be modified.
     """
     documents = [
         Document(
@@ -79,9 +105,61 @@ def create_sample_documents():
             metadata={"source": "concepts", "topic": "vectorstores"}
         )
     ]
-    return documents
+    return tuple(documents)
+
+@lru_cache(maxsize=None)
+def load_sample_chunks():
+    """
+    Split the sample documents into chunks.
+    The chunks are computed once from the cached corpus and reused on later
+    calls. The tuple itself can't be modified, but the Document objects in
+    it are shared, so callers should not change them.
+    """
+    return tuple(TEXT_SPLITTER.split_documents(create_sample_documents()))
+
+def build_vectorstore(texts, embeddings):
+    """
+    Build an in-memory FAISS vector store from document chunks.
+    The chunks are embedded up front, so the vector store only has to
+    index vectors that are already computed.
+    """
+    # Embed all chunks with a single embed_documents call, which sends them
+    # to the API together rather than one request per chunk
+    contents = [text.page_content for text in texts]
+    vectors = embeddings.embed_documents(contents)
+    
+    # FAISS keeps the vectors in memory. An HNSW index searches a graph of
+    # neighbouring vectors, so queries stay fast as the corpus grows instead
+    # of scanning every vector.
+    #
+    # The chunk vectors are scaled to unit length here, so ranking by inner
+    # product is the same as ranking by cosine similarity whichever
+    # embedding model is used. Query vectors don't need it: scaling the
+    # query changes every score by the same factor, not the ranking, and
+    # OpenAI query embeddings are already unit length anyway.
+    vectors = np.asarray(vectors, dtype="float32")
+    faiss.normalize_L2(vectors)
+    
+    index = faiss.IndexHNSWFlat(len(vectors[0]), HNSW_NEIGHBORS, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    index.hnsw.efSearch = HNSW_EF_SEARCH
+    
+    vectorstore = FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={},
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+    )
+    # Chunk ids are their position, so they are the same on every run
+    vectorstore.add_embeddings(
+        text_embeddings=list(zip(contents, vectors.tolist())),
+        metadatas=[text.metadata for text in texts],
+        ids=[str(i) for i in range(len(texts))]
+    )
+    return vectorstore
 
-def main():
+async def main():
     """
     Demonstrate RAG by creating a question-answering system over custom documents.
     """
@@ -100,24 +178,33 @@ def main():
     print(f"Created {len(documents)} documents about LangChain")
     
     print("\nStep 2: Splitting documents into chunks...")
-    text_splitter = CharacterTextSplitter(
-        chunk_size=500,
-        chunk_overlap=50
-    )
-    texts = text_splitter.split_documents(documents)
+    texts = load_sample_chunks()
     print(f"Split into {len(texts)} text chunks")
     
     print("\nStep 3: Creating embeddings and vector store...")
-    embeddings = OpenAIEmbeddings()
-    vectorstore = Chroma.from_documents(
-        documents=texts,
-        embedding=embeddings,
-        collection_name="langchain_docs"
+    # Cache embeddings on disk so later runs don't re-embed the same text.
+    # The namespace keeps vectors from different embedding models apart.
+    underlying_embeddings = OpenAIEmbeddings(
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client()
+    )
+    embeddings = CacheBackedEmbeddings.from_bytes_store(
+        underlying_embeddings,
+        LocalFileStore("./cache/"),
+        namespace=underlying_embeddings.model,
+        query_embedding_cache=True
     )
+    vectorstore = build_vectorstore(texts, embeddings)
     print("Vector store created successfully!")
     
     print("\nStep 4: Setting up the QA chain...")
-    llm = ChatOpenAI(temperature=0, model="gpt-3.5-turbo")
+    llm = ChatOpenAI(
+        temperature=0,
+        model="gpt-3.5-turbo",
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        rate_limiter=get_rate_limiter()
+    )
     qa_chain = RetrievalQA.from_chain_type(
         llm=llm,
         chain_type="stuff",
@@ -139,11 +226,15 @@ def main():
     print("Asking questions based on the documents:")
     print("=" * 50)
     
-    for i, question in enumerate(questions, 1):
+    # Ask all questions concurrently
+    results = await gather_bounded(
+        lambda question: qa_chain.ainvoke({"query": question}),
+        questions
+    )
+    
+    for i, (question, result) in enumerate(zip(questions, results), 1):
         print(f"\nQuestion {i}: {question}")
         print("-" * 50)
-        
-        result = qa_chain.invoke({"query": question})
         print(f"Answer: {result['result']}")
         
         # Show which documents were used
@@ -158,4 +249,4 @@ def main():
     print("reducing hallucinations and providing more accurate, grounded responses.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -6,6 +6,7 @@ This example demonstrates:
 - Setting up an agent
 - Letting the agent decide which tools to use
 - Agent reasoning and decision-making
+- Calling several tools in a single step
 
 Agents are powerful because they can:
 - Reason about problems
@@ -17,16 +18,81 @@ Prerequisites:
 - Set up your OPENAI_API_KEY in .env file
 """
 
+import ast
+import asyncio
 import os
+import re
+import tempfile
+import time
 from datetime import datetime
-from dotenv import load_dotenv
+from pathlib import Path
 from langchain_openai import ChatOpenAI
-from langchain.agents import Tool, AgentExecutor, create_react_agent
-from langchain.prompts import PromptTemplate
+from langchain.agents import Tool, AgentExecutor, create_openai_tools_agent
+from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain import hub
+from langchain_core.load import dumps, loads
+# Importing common also loads environment variables from .env
+from common import (
+    VERBOSE,
+    gather_bounded,
+    get_async_http_client,
+    get_http_client,
+    get_rate_limiter,
+)
 
-# Load environment variables
-load_dotenv()
+# Where prompts pulled from LangChain Hub are cached, and for how long
+HUB_CACHE_DIR = Path("~/.cache/langchain_hub").expanduser()
+HUB_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+
+# Matches a single word; compiled once and reused by the word counter
+WORD_PATTERN = re.compile(r"\w+")
+
+# The AST nodes a safe calculator expression may contain
+CALCULATOR_NODES = frozenset({
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Pow,
+    ast.USub,
+})
+
+def pull_hub_prompt(path: str):
+    """
+    Pull a prompt from LangChain Hub.
+    A copy is cached on disk as JSON and reused for a day to skip the
+    network fetch.
+    """
+    cache_path = HUB_CACHE_DIR / f"{path.replace('/', '_')}.json"
+    try:
+        if time.time() - cache_path.stat().st_mtime < HUB_CACHE_MAX_AGE:
+            return loads(cache_path.read_text(encoding="utf-8"))
+    except Exception:
+        # A missing, broken or outdated cache file just means pulling again
+        pass
+    
+    prompt = hub.pull(path)
+    
+    # Write to a temporary file and move it into place, so an interrupted
+    # write never leaves a broken cache file behind. Failing to cache is
+    # not an error: the pulled prompt is still used.
+    tmp_path = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_path.parent, suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = f.name
+            f.write(dumps(prompt))
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return prompt
 
 def get_current_time(input_text: str) -> str:
     """
@@ -35,60 +101,53 @@ def get_current_time(input_text: str) -> str:
     now = datetime.now()
     return f"Current date and time: {now.strftime('%Y-%m-%d %H:%M:%S')}"
 
+def validate_expression(tree):
+    """
+    Check that a parsed expression only contains numbers and arithmetic operations.
+    """
+    for node in ast.walk(tree):
+        if type(node) not in CALCULATOR_NODES:
+            raise ValueError(f"Unsupported operation: {node}")
+        # Only plain numbers are allowed; bool is a subclass of int, so reject it explicitly
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+
 def calculator(expression: str) -> str:
     """
     Tool to perform basic calculations.
     Safely evaluates mathematical expressions using ast.
     """
-    import ast
-    import operator
-    
-    # Define safe operators
-    operators = {
-        ast.Add: operator.add,
-        ast.Sub: operator.sub,
-        ast.Mult: operator.mul,
-        ast.Div: operator.truediv,
-        ast.Pow: operator.pow,
-        ast.USub: operator.neg,
-    }
-    
-    def safe_eval(node):
-        """Safely evaluate an AST node."""
-        if isinstance(node, ast.Num):  # number
-            return node.n
-        elif isinstance(node, ast.BinOp):  # binary operation
-            left = safe_eval(node.left)
-            right = safe_eval(node.right)
-            return operators[type(node.op)](left, right)
-        elif isinstance(node, ast.UnaryOp):  # unary operation
-            operand = safe_eval(node.operand)
-            return operators[type(node.op)](operand)
-        else:
-            raise ValueError(f"Unsupported operation: {node}")
-    
     try:
-        # Parse the expression
+        # Parse and validate the expression
         tree = ast.parse(expression, mode='eval')
-        result = safe_eval(tree.body)
+        validate_expression(tree)
+        # The tree is known to be plain arithmetic, so let Python evaluate it
+        # directly with no builtins available
+        code = compile(tree, "<calculator>", "eval")
+        result = eval(code, {"__builtins__": {}}, {})
         return f"The result of {expression} is {result}"
-    except (SyntaxError, ValueError, TypeError, KeyError, ZeroDivisionError) as e:
+    except (SyntaxError, ValueError, TypeError, ZeroDivisionError, OverflowError) as e:
         return f"Error calculating '{expression}': {str(e)}. Only basic arithmetic operations (+, -, *, /, **) are supported."
 
 def word_counter(text: str) -> str:
     """
     Tool to count words in a text.
+    Punctuation is ignored, so "LLM applications'?" counts as two words.
     """
-    words = text.split()
+    words = WORD_PATTERN.findall(text)
     return f"The text contains {len(words)} words"
 
 def reverse_text(text: str) -> str:
     """
     Tool to reverse a string.
+    The result is returned to the agent as a string, so it has to be built
+    in full; slicing does that with a single copy of the text.
     """
     return f"Reversed text: {text[::-1]}"
 
-def main():
+async def main():
     """
     Demonstrate an agent with multiple tools.
     """
@@ -135,44 +194,35 @@ def main():
     print("\nStep 2: Setting up the agent...")
     
     # Initialize the LLM
-    llm = ChatOpenAI(temperature=0, model="gpt-3.5-turbo")
+    llm = ChatOpenAI(
+        temperature=0,
+        model="gpt-3.5-turbo",
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        rate_limiter=get_rate_limiter()
+    )
     
-    # Get the ReAct prompt from the hub
+    # Get the OpenAI tools agent prompt from the hub (or the local cache)
     try:
-        prompt = hub.pull("hwchase17/react")
+        prompt = pull_hub_prompt("hwchase17/openai-tools-agent")
     except (ImportError, ConnectionError, Exception) as e:
         # Fallback prompt if hub is unavailable
         print(f"Note: Using fallback prompt (hub unavailable: {e})")
-        template = """Answer the following questions as best you can. You have access to the following tools:
-
-{tools}
-
-Use the following format:
-
-Question: the input question you must answer
-Thought: you should always think about what to do
-Action: the action to take, should be one of [{tool_names}]
-Action Input: the input to the action
-Observation: the result of the action
-... (this Thought/Action/Action Input/Observation can repeat N times)
-Thought: I now know the final answer
-Final Answer: the final answer to the original input question
-
-Begin!
-
-Question: {input}
-Thought:{agent_scratchpad}"""
-        
-        prompt = PromptTemplate.from_template(template)
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", "You are a helpful assistant. Use the available tools to answer the question."),
+            ("human", "{input}"),
+            MessagesPlaceholder(variable_name="agent_scratchpad")
+        ])
     
-    # Create the agent
-    agent = create_react_agent(llm, tools, prompt)
+    # Create the agent. It uses OpenAI tool calling, so the model can request
+    # several tools in one response instead of one tool per reasoning step.
+    agent = create_openai_tools_agent(llm, tools, prompt)
     
     # Create the agent executor
     agent_executor = AgentExecutor(
         agent=agent,
         tools=tools,
-        verbose=True,
+        verbose=VERBOSE,  # Set LANGCHAIN_VERBOSE=true to see each step
         handle_parsing_errors=True,
         max_iterations=5
     )
@@ -192,16 +242,23 @@ Thought:{agent_scratchpad}"""
     print("Running agent with different queries:")
     print("=" * 50)
     
-    for i, query in enumerate(queries, 1):
+    # Run all queries concurrently; a failed query is returned as its
+    # exception so the others still complete
+    results = await gather_bounded(
+        lambda query: agent_executor.ainvoke({"input": query}),
+        queries,
+        return_exceptions=True
+    )
+    
+    for i, (query, result) in enumerate(zip(queries, results), 1):
         print(f"\n{'=' * 50}")
         print(f"Query {i}: {query}")
         print("=" * 50)
         
-        try:
-            result = agent_executor.invoke({"input": query})
+        if isinstance(result, Exception):
+            print(f"Error: {str(result)}")
+        else:
             print(f"\nFinal Answer: {result['output']}")
-        except Exception as e:
-            print(f"Error: {str(e)}")
         
         print()
     
@@ -212,4 +269,4 @@ Thought:{agent_scratchpad}"""
     print("to answer each question. This demonstrates the power of agent-based systems!")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
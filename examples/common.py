@@ -0,0 +1,77 @@
+"""
+Shared setup and helpers for the examples.
+
+Importing this module loads environment variables from the .env file.
+The examples pass its HTTP clients to their OpenAI models so that
+connections are kept alive and reused between requests instead of
+opening a new TLS connection for each model. Chat models also share a
+rate limiter, so requests wait for their turn instead of being rejected
+by the API.
+"""
+
+import asyncio
+import os
+from functools import lru_cache
+
+import httpx
+from dotenv import load_dotenv
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+# Load environment variables once for every example that imports this module
+load_dotenv()
+
+# Print intermediate agent steps only when LANGCHAIN_VERBOSE is set to true
+VERBOSE = os.getenv("LANGCHAIN_VERBOSE", "").lower() in ("1", "true", "yes")
+
+# How many requests an example may have in flight at the same time
+MAX_CONCURRENT_REQUESTS = 5
+
+# Request budget for chat model calls; lower this to match your OpenAI plan
+MAX_REQUESTS_PER_MINUTE = 3000
+
+# Connection pool limits shared by the sync and async clients
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+async def gather_bounded(coro_fn, items, return_exceptions=False):
+    """
+    Await coro_fn(item) for every item concurrently and return the results
+    in the order of items.
+    Use it for independent requests: they overlap instead of waiting for
+    each other, while at most MAX_CONCURRENT_REQUESTS are in flight at once
+    to stay under API rate limits.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    async def run(item):
+        async with semaphore:
+            return await coro_fn(item)
+    
+    return await asyncio.gather(
+        *(run(item) for item in items),
+        return_exceptions=return_exceptions
+    )
+
+@lru_cache(maxsize=None)
+def get_http_client() -> httpx.Client:
+    """
+    Return the HTTP client shared by all synchronous OpenAI calls.
+    """
+    return httpx.Client(http2=True, limits=HTTP_LIMITS)
+
+@lru_cache(maxsize=None)
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Return the HTTP client shared by all asynchronous OpenAI calls.
+    """
+    return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS)
+
+@lru_cache(maxsize=None)
+def get_rate_limiter() -> InMemoryRateLimiter:
+    """
+    Return the token-bucket rate limiter shared by all chat models.
+    """
+    return InMemoryRateLimiter(
+        requests_per_second=MAX_REQUESTS_PER_MINUTE / 60,
+        check_every_n_seconds=0.1,
+        max_bucket_size=MAX_CONCURRENT_REQUESTS
+    )